@@ -1,8 +1,10 @@
 # src/config.py
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
+import copy
 import yaml
 from pathlib import Path
 import logging
+from pydantic import BaseModel, validator
 
 logger = logging.getLogger(__name__)
 
@@ -16,18 +18,232 @@ DEFAULT_CONFIG = {
         "sma_long_window": 200,
         "lookback_trading_days_for_52w": 252,
     },
+    "profile": None,
+    "performance": {
+        "workers": 1,
+        "db_batch_size": 500,
+        "cache_ttl_seconds": 3600,
+        "export_format": "json",
+    },
+}
+
+# named run profiles; applied on top of the defaults, below the config file.
+# workers and cache_ttl_seconds are validated but not read yet: the pipeline has
+# no worker pool or fetch cache, so only db_batch_size and export_format take effect.
+PROFILES: Dict[str, Dict[str, Any]] = {
+    # 2y keeps the last year of SMA200/52-week values on full windows;
+    # rows already stored are updated in place by save_daily_metrics
+    "nightly-incremental": {
+        "data_settings": {"historical_period": "2y"},
+        "performance": {
+            "workers": 4,
+            "db_batch_size": 500,
+            "cache_ttl_seconds": 6 * 3600,
+            "export_format": "json",
+        },
+    },
+    "full-backfill": {
+        "data_settings": {"historical_period": "max"},
+        "performance": {
+            "workers": 8,
+            "db_batch_size": 5000,
+            "cache_ttl_seconds": 0,
+            "export_format": "jsonl",
+        },
+    },
 }
 
-def load_config(path: str | None = None) -> Dict[str, Any]:
-    if path:
-        p = Path(path)
-        if p.exists():
-            with p.open("r", encoding="utf-8") as fh:
-                cfg = yaml.safe_load(fh) or {}
-                # shallow merge defaults
-                merged = DEFAULT_CONFIG.copy()
-                merged.update(cfg)
-                return merged
+EXPORT_FORMATS = ("json", "json-compact", "jsonl")
+
+# approximate trading days per yfinance period unit
+_PERIOD_UNIT_DAYS = {"d": 1, "wk": 5, "mo": 21, "y": 252}
+
+
+def period_trading_days(period: str) -> Optional[int]:
+    """
+    Approximate number of trading days covered by a yfinance period such as "5d", "6mo" or "2y".
+    Returns None for "max" (unbounded). Raises ValueError for anything else, including "ytd",
+    whose length depends on the run date.
+    """
+    if period == "max":
+        return None
+    for unit, days in _PERIOD_UNIT_DAYS.items():
+        count = period[: -len(unit)]
+        if period.endswith(unit) and count.isdigit():
+            return int(count) * days
+    raise ValueError(f"unsupported historical_period {period!r}; use e.g. 6mo, 2y, 5y or max")
+
+
+class DatabaseSettings(BaseModel):
+    class Config:
+        extra = "forbid"
+
+    path: str
+
+
+class LoggingSettings(BaseModel):
+    class Config:
+        extra = "forbid"
+
+    level: str
+
+    @validator("level")
+    def level_must_be_known(cls, v):
+        if v.upper() not in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"):
+            raise ValueError(f"unknown logging level {v!r}")
+        return v.upper()
+
+
+class DataSettings(BaseModel):
+    class Config:
+        extra = "forbid"
+
+    historical_period: str
+    min_trading_days_for_sma: int
+    sma_short_window: int
+    sma_long_window: int
+    lookback_trading_days_for_52w: int
+
+    @validator("min_trading_days_for_sma", "sma_short_window", "sma_long_window", "lookback_trading_days_for_52w")
+    def must_be_positive(cls, v):
+        if v <= 0:
+            raise ValueError("window sizes must be positive")
+        return v
+
+    @validator("sma_long_window")
+    def long_must_exceed_short(cls, v, values):
+        short = values.get("sma_short_window")
+        if short is not None and v <= short:
+            raise ValueError("sma_long_window must be greater than sma_short_window")
+        return v
+
+    @validator("lookback_trading_days_for_52w")
+    def period_must_cover_windows(cls, v, values):
+        # rolling windows use min_periods=1, so a short history silently yields partial-window values
+        period = values.get("historical_period")
+        if period is None:
+            return v
+        available = period_trading_days(period)
+        longest = max(v, values.get("sma_long_window") or 0)
+        if available is not None and available <= longest:
+            raise ValueError(
+                f"historical_period {period!r} (~{available} trading days) must cover more than "
+                f"the longest window ({longest} days)"
+            )
+        return v
+
+
+class PerformanceSettings(BaseModel):
+    class Config:
+        extra = "forbid"
+
+    workers: int
+    db_batch_size: int
+    cache_ttl_seconds: int
+    export_format: str
+
+    @validator("workers", "db_batch_size")
+    def must_be_positive(cls, v):
+        if v < 1:
+            raise ValueError("must be at least 1")
+        return v
+
+    @validator("cache_ttl_seconds")
+    def ttl_not_negative(cls, v):
+        if v < 0:
+            raise ValueError("cache_ttl_seconds must not be negative")
+        return v
+
+    @validator("export_format")
+    def format_must_be_known(cls, v):
+        if v not in EXPORT_FORMATS:
+            raise ValueError(f"export_format must be one of {', '.join(EXPORT_FORMATS)}")
+        return v
+
+
+class AppConfig(BaseModel):
+    class Config:
+        extra = "forbid"
+
+    database: DatabaseSettings
+    logging: LoggingSettings
+    data_settings: DataSettings
+    profile: Optional[str] = None
+    performance: PerformanceSettings
+
+    @validator("profile")
+    def profile_must_exist(cls, v):
+        if v is not None and (not isinstance(v, str) or v not in PROFILES):
+            raise ValueError(f"unknown profile {v!r}; expected one of {', '.join(sorted(PROFILES))}")
+        return v
+
+
+def deep_merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return a new dict with override merged into base.
+    Nested dicts are merged key by key; any other value in override replaces the one in base.
+    """
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
         else:
-            logger.warning("Config file %s not found, using defaults", path)
-    return DEFAULT_CONFIG.copy()
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def _read_yaml(path: Optional[str]) -> Dict[str, Any]:
+    if not path:
+        return {}
+    p = Path(path)
+    if not p.exists():
+        logger.warning("Config file %s not found, using defaults", path)
+        return {}
+    with p.open("r", encoding="utf-8") as fh:
+        cfg = yaml.safe_load(fh) or {}
+    if not isinstance(cfg, dict):
+        raise ValueError(f"Config file {path} must contain a mapping at the top level")
+    return cfg
+
+
+def load_config(path: Optional[str] = None, profile: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build the effective config: defaults <- profile <- config file.
+    The profile comes from the `profile` argument, else the file's `profile:` key.
+    Raises ValueError if the result fails validation.
+    """
+    file_cfg = _read_yaml(path)
+    profile = profile or file_cfg.get("profile")
+
+    if profile is not None and not isinstance(profile, str):
+        raise ValueError(f"profile must be a string, got {type(profile).__name__}")
+
+    merged = copy.deepcopy(DEFAULT_CONFIG)
+    if profile:
+        if profile not in PROFILES:
+            raise ValueError(f"unknown profile {profile!r}; expected one of {', '.join(sorted(PROFILES))}")
+        merged = deep_merge(merged, PROFILES[profile])
+    merged = deep_merge(merged, file_cfg)
+    merged["profile"] = profile
+
+    try:
+        validated = AppConfig(**merged)
+    except Exception as exc:
+        raise ValueError(f"Invalid configuration: {exc}") from exc
+    logger.debug("Loaded config (profile=%s) from %s", profile, path or "defaults")
+    return validated.dict()
+
+
+_CONFIG_CACHE: Dict[Tuple[Optional[str], Optional[str]], Dict[str, Any]] = {}
+
+
+def get_config(path: Optional[str] = None, profile: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Load the config once per (path, profile) and reuse it.
+    The returned dict is plain and picklable, so the parent process can load it
+    once and hand it to worker processes instead of each worker re-reading YAML.
+    """
+    key = (path, profile)
+    if key not in _CONFIG_CACHE:
+        _CONFIG_CACHE[key] = load_config(path, profile)
+    return copy.deepcopy(_CONFIG_CACHE[key])
@@ -58,10 +58,14 @@ def init_db(db_path: str):
     return sessionmaker(bind=engine)
 
 
-def save_daily_metrics(Session, ticker: str, df):
+def save_daily_metrics(Session, ticker: str, df, batch_size: int = 500):
     session = Session()
     inserted = 0
+    committed = 0
     try:
+        # merge() matches on the primary key only, so look up rows already stored for
+        # this ticker by date; re-runs then update them instead of hitting uix_ticker_date
+        existing_ids = dict(session.query(DailyMetric.date, DailyMetric.id).filter(DailyMetric.ticker == ticker))
         for _, r in df.iterrows():
             dm = DailyMetric(
                 ticker=ticker,
@@ -72,15 +76,23 @@ def save_daily_metrics(Session, ticker: str, df):
                 pb_ratio=float(r.get("pb_ratio")) if r.get("pb_ratio") is not None else None,
                 ev=float(r.get("ev")) if r.get("ev") is not None else None,
             )
-            # session.merge will insert or update based on primary key/unique constraints
+            dm.id = existing_ids.get(dm.date)
             try:
                 session.merge(dm)
             except Exception:
                 logger.exception("Failed merging daily metric row for %s %s", ticker, r.get("date"))
+                continue
+            inserted += 1
+            # commit in batches so long backfills don't hold one huge transaction
+            if inserted % batch_size == 0:
+                session.commit()
+                committed = inserted
         session.commit()
     except Exception:
         session.rollback()
-        logger.exception("Failed to save daily metrics for %s", ticker)
+        logger.exception(
+            "Failed to save daily metrics for %s; %d rows were committed before the failure", ticker, committed
+        )
     finally:
         session.close()
 
@@ -88,6 +100,12 @@ def save_daily_metrics(Session, ticker: str, df):
 def save_signals(Session, ticker: str, signal_rows: List[dict]):
     session = Session()
     try:
+        existing_ids = {
+            (d, t): i
+            for d, t, i in session.query(SignalEvent.date, SignalEvent.signal_type, SignalEvent.id).filter(
+                SignalEvent.ticker == ticker
+            )
+        }
         for s in signal_rows:
             se = SignalEvent(
                 ticker=ticker,
@@ -97,6 +115,7 @@ def save_signals(Session, ticker: str, signal_rows: List[dict]):
                 sma_long=float(s.get("sma_long")) if s.get("sma_long") is not None else None,
                 note=s.get("note"),
             )
+            se.id = existing_ids.get((se.date, se.signal_type))
             session.merge(se)
         session.commit()
     except Exception:
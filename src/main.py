@@ -3,7 +3,8 @@ from typing import Optional
 import typer
 import logging
 import json
-from src.config import load_config
+import sys
+from src.config import get_config
 from src.data_fetcher import fetch_stock_data
 from src.processor import process_data
 from src.signals import detect_golden_cross, detect_death_cross
@@ -16,13 +17,35 @@ app = typer.Typer()
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
 logger = logging.getLogger(__name__)
 
+def _serialize_export(export_obj: dict, export_format: str, pretty: bool = True) -> str:
+    if export_format == "jsonl":
+        # header on its own line; rows carry only the ticker so company_info isn't repeated
+        header = {k: v for k, v in export_obj.items() if k not in ("metrics", "signals")}
+        ticker = export_obj["ticker"]
+        lines = [json.dumps({"record": "header", **header}, default=str)]
+        lines += [json.dumps({"record": "metric", "ticker": ticker, **m}, default=str) for m in export_obj["metrics"]]
+        lines += [json.dumps({"record": "signal", "ticker": ticker, **s}, default=str) for s in export_obj["signals"]]
+        return "\n".join(lines) + "\n"
+    if export_format == "json-compact":
+        return json.dumps(export_obj, default=str, separators=(",", ":"))
+    if pretty:
+        return json.dumps(export_obj, default=str, indent=2)
+    return json.dumps(export_obj, default=str)
+
+
 @app.command()
 def analyze(
     ticker: str = typer.Option(..., help="Ticker to analyze, e.g. NVDA or RELIANCE.NS"),
-    output: Optional[str] = typer.Option(None, help="Path to JSON output"),
+    output: Optional[str] = typer.Option(None, help="Path to output file (json, json-compact or jsonl per export_format)"),
     config_path: Optional[str] = typer.Option(None, help="Path to config.yaml"),
+    profile: Optional[str] = typer.Option(None, help="Run profile, e.g. nightly-incremental or full-backfill"),
 ):
-    cfg = load_config(config_path)
+    try:
+        cfg = get_config(config_path, profile)
+    except ValueError as exc:
+        logger.error("%s", exc)
+        raise typer.Exit(code=2)
+    perf = cfg["performance"]
     try:
         raw = fetch_stock_data(ticker, period=cfg["data_settings"].get("historical_period", "5y"))
         df = process_data(raw, cfg)
@@ -53,7 +76,7 @@ def analyze(
 
         # Save to DB
         Session = init_db(cfg["database"]["path"])
-        save_daily_metrics(Session, ticker, df)
+        save_daily_metrics(Session, ticker, df, batch_size=perf["db_batch_size"])
         save_signals(Session, ticker, signals)
 
         processed_rows = []
@@ -79,10 +102,12 @@ def analyze(
 
         if output:
             with open(output, "w", encoding="utf-8") as fh:
-                json.dump(export_obj, fh, default=str, indent=2)
-            logger.info("Wrote JSON to %s", output)
+                fh.write(_serialize_export(export_obj, perf["export_format"]))
+            logger.info("Wrote %s to %s", perf["export_format"], output)
         else:
-            print(json.dumps(export_obj, default=str))
+            # stdout stays single-line JSON in "json" mode, as before profiles existed
+            text = _serialize_export(export_obj, perf["export_format"], pretty=False)
+            sys.stdout.write(text if text.endswith("\n") else text + "\n")
 
     except Exception as exc:
         logger.exception("Failed to run analysis for %s", ticker)
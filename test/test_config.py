@@ -0,0 +1,104 @@
+# tests/test_config.py
+from pathlib import Path
+import pytest
+from src import config as config_mod
+from src.config import load_config, get_config, deep_merge, DEFAULT_CONFIG
+
+EXAMPLE_CONFIG = Path(__file__).resolve().parent.parent / "config.yaml.example"
+
+
+def _write(tmp_path, text):
+    p = tmp_path / "config.yaml"
+    p.write_text(text, encoding="utf-8")
+    return str(p)
+
+
+def test_partial_section_keeps_other_defaults(tmp_path):
+    cfg = load_config(_write(tmp_path, "data_settings:\n  sma_long_window: 100\n"))
+    assert cfg["data_settings"]["sma_long_window"] == 100
+    assert cfg["data_settings"]["sma_short_window"] == 50
+    assert cfg["data_settings"]["historical_period"] == "5y"
+
+
+def test_profile_then_file_override(tmp_path):
+    cfg = load_config(_write(tmp_path, "profile: full-backfill\nperformance:\n  workers: 2\n"))
+    assert cfg["profile"] == "full-backfill"
+    assert cfg["performance"]["workers"] == 2
+    assert cfg["performance"]["db_batch_size"] == 5000
+    assert cfg["performance"]["export_format"] == "jsonl"
+
+
+def test_shipped_example_does_not_mask_profile():
+    cfg = load_config(str(EXAMPLE_CONFIG), profile="full-backfill")
+    assert cfg["data_settings"]["historical_period"] == "max"
+    assert cfg["performance"] == config_mod.PROFILES["full-backfill"]["performance"]
+
+
+@pytest.mark.parametrize("profile", sorted(config_mod.PROFILES))
+def test_profiles_cover_longest_window(profile):
+    ds = load_config(profile=profile)["data_settings"]
+    available = config_mod.period_trading_days(ds["historical_period"])
+    longest = max(ds["sma_long_window"], ds["lookback_trading_days_for_52w"])
+    assert available is None or available > longest
+
+
+@pytest.mark.parametrize("period, expected", [("5d", 5), ("6mo", 126), ("2y", 504), ("max", None)])
+def test_period_trading_days(period, expected):
+    assert config_mod.period_trading_days(period) == expected
+
+
+def test_unknown_profile_rejected():
+    with pytest.raises(ValueError):
+        load_config(profile="does-not-exist")
+
+
+def test_non_string_profile_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        load_config(_write(tmp_path, "profile:\n  - full-backfill\n"))
+
+
+@pytest.mark.parametrize("text", [
+    "perfomance:\n  workers: 2\n",
+    "performance:\n  db_batchsize: 5000\n",
+    "data_settings:\n  sma_window: 10\n",
+])
+def test_unknown_keys_rejected(tmp_path, text):
+    with pytest.raises(ValueError):
+        load_config(_write(tmp_path, text))
+
+
+@pytest.mark.parametrize("text", [
+    "data_settings:\n  sma_short_window: 200\n  sma_long_window: 200\n",
+    "performance:\n  db_batch_size: 0\n",
+    "performance:\n  cache_ttl_seconds: -1\n",
+    "performance:\n  export_format: csv\n",
+    "data_settings:\n  historical_period: 6mo\n",
+    "data_settings:\n  historical_period: 1y\n",
+    "data_settings:\n  historical_period: 2y\n  lookback_trading_days_for_52w: 600\n",
+    "data_settings:\n  historical_period: ytd\n",
+    "- just\n- a list\n",
+])
+def test_invalid_values_rejected(tmp_path, text):
+    with pytest.raises(ValueError):
+        load_config(_write(tmp_path, text))
+
+
+def test_get_config_loads_once_and_returns_copies(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_load(path=None, profile=None):
+        calls.append((path, profile))
+        return {"performance": {"workers": 1}}
+
+    monkeypatch.setattr(config_mod, "_CONFIG_CACHE", {})
+    monkeypatch.setattr(config_mod, "load_config", fake_load)
+    first = get_config("a.yaml", "full-backfill")
+    first["performance"]["workers"] = 99
+    second = get_config("a.yaml", "full-backfill")
+    assert calls == [("a.yaml", "full-backfill")]
+    assert second["performance"]["workers"] == 1
+
+
+def test_deep_merge_does_not_mutate_defaults():
+    deep_merge(DEFAULT_CONFIG, {"data_settings": {"sma_short_window": 10}})
+    assert DEFAULT_CONFIG["data_settings"]["sma_short_window"] == 50
@@ -0,0 +1,78 @@
+# tests/test_database.py
+import pandas as pd
+from src.database import init_db, save_daily_metrics, save_signals, DailyMetric, SignalEvent
+
+
+class _FakeSession:
+    def __init__(self, fail_on=None):
+        self.merged = 0
+        self.commits = []
+        self.fail_on = fail_on or set()
+
+    def query(self, *columns):
+        return self
+
+    def filter(self, *criteria):
+        return []
+
+    def merge(self, obj):
+        self.merged += 1
+        if self.merged in self.fail_on:
+            raise RuntimeError("merge failed")
+
+    def commit(self):
+        self.commits.append(self.merged)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _df(n):
+    return pd.DataFrame({"date": pd.date_range("2023-01-01", periods=n, freq="D"), "close": [1.0] * n})
+
+
+def test_commits_at_each_batch_boundary():
+    session = _FakeSession()
+    save_daily_metrics(lambda: session, "NVDA", _df(5), batch_size=2)
+    assert session.commits == [2, 4, 5]
+
+
+def test_failed_merges_do_not_count_toward_batch():
+    session = _FakeSession(fail_on={2})
+    save_daily_metrics(lambda: session, "NVDA", _df(5), batch_size=2)
+    # merge attempts 1 and 3 succeed before the first commit
+    assert session.commits == [3, 5, 5]
+
+
+def test_rerun_updates_existing_dates_and_adds_new_ones(tmp_path):
+    Session = init_db(str(tmp_path / "test.db"))
+    first = _df(10)
+    save_daily_metrics(Session, "NVDA", first, batch_size=3)
+
+    # overlaps the last 5 stored dates and adds 5 new ones, like a nightly re-run
+    second = pd.DataFrame({"date": pd.date_range("2023-01-06", periods=10, freq="D"), "close": [2.0] * 10})
+    save_daily_metrics(Session, "NVDA", second, batch_size=3)
+
+    session = Session()
+    rows = session.query(DailyMetric).filter(DailyMetric.ticker == "NVDA").order_by(DailyMetric.date).all()
+    session.close()
+    assert len(rows) == 15
+    assert [r.close for r in rows] == [1.0] * 5 + [2.0] * 10
+
+
+def test_rerun_signals_updates_existing(tmp_path):
+    Session = init_db(str(tmp_path / "test.db"))
+    day = pd.Timestamp("2023-01-05")
+    save_signals(Session, "NVDA", [{"date": day, "signal_type": "golden_cross", "sma_short": 1.0}])
+    save_signals(Session, "NVDA", [
+        {"date": day, "signal_type": "golden_cross", "sma_short": 2.0},
+        {"date": pd.Timestamp("2023-02-01"), "signal_type": "death_cross"},
+    ])
+
+    session = Session()
+    rows = session.query(SignalEvent).order_by(SignalEvent.date).all()
+    session.close()
+    assert [(r.signal_type, r.sma_short) for r in rows] == [("golden_cross", 2.0), ("death_cross", None)]
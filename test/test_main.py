@@ -0,0 +1,37 @@
+# tests/test_main.py
+import json
+from src.main import _serialize_export
+
+
+def _export(metrics=None, signals=None):
+    return {
+        "ticker": "NVDA",
+        "generated_at": "2025-01-01T00:00:00Z",
+        "company_info": {"ticker": "NVDA", "currency": "USD"},
+        "metrics": metrics if metrics is not None else [{"date": "2025-01-01", "close": 1.0}],
+        "signals": signals if signals is not None else [{"date": "2025-01-01", "signal_type": "golden_cross"}],
+    }
+
+
+def test_json_modes_round_trip():
+    obj = _export()
+    pretty = _serialize_export(obj, "json")
+    assert "\n" in pretty and json.loads(pretty) == obj
+    plain = _serialize_export(obj, "json", pretty=False)
+    assert "\n" not in plain and json.loads(plain) == obj
+    compact = _serialize_export(obj, "json-compact")
+    assert ", " not in compact and json.loads(compact) == obj
+
+
+def test_jsonl_writes_header_once():
+    lines = _serialize_export(_export(), "jsonl").splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [r["record"] for r in records] == ["header", "metric", "signal"]
+    assert records[0]["company_info"] == {"ticker": "NVDA", "currency": "USD"}
+    assert all("company_info" not in r and r["ticker"] == "NVDA" for r in records[1:])
+
+
+def test_jsonl_keeps_header_when_empty():
+    text = _serialize_export(_export(metrics=[], signals=[]), "jsonl")
+    assert text.endswith("\n") and not text.endswith("\n\n")
+    assert json.loads(text)["record"] == "header"